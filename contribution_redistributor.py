@@ -5,75 +5,315 @@ Analyzes commit history and redistributes commits to fill gaps and maintain cons
 """
 
 import subprocess
+import hashlib
 import json
+import math
 import os
+import random
 import sys
-from datetime import datetime, timedelta
-from collections import defaultdict
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from collections import Counter, defaultdict
+from itertools import chain
+from operator import itemgetter, mul, sub
 from pathlib import Path
-import statistics
+
+# Indexed by date.weekday()
+_DAY_ABBR = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# Read-only git: no pager, no optional locks
+_GIT = ['git', '--no-pager', '--no-optional-locks']
+
+# Parsed git log cache; bump the format when the cached fields change
+_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                          'commitor')
+_CACHE_FORMAT = 4
+
+
+def _iter_nul_fields(stream, chunk_size=1 << 16):
+    """Yield NUL-separated fields from a binary stream as they arrive."""
+    pending = None
+    for chunk in iter(lambda: stream.read1(chunk_size), b''):
+        fields = (pending + chunk if pending else chunk).split(b'\0')
+        pending = fields.pop()
+        yield from fields
+    # The last field has no trailing NUL; it may legitimately be empty
+    if pending is not None:
+        yield pending
+
+
+@lru_cache(maxsize=None)
+def _parse_day(day_str):
+    """Return the shared date object for a 'YYYY-MM-DD' string."""
+    return date(int(day_str[0:4]), int(day_str[5:7]), int(day_str[8:10]))
+
+
+def _make_commit(repo_path, commit_hash, ts, tz, date_str, message):
+    """Build a commit record from git log fields (or their cached copy)."""
+    # Newer git prints UTC as a trailing 'Z'
+    if date_str.endswith('Z'):
+        date_str = date_str[:-1] + '+00:00'
+    
+    # %aI is fixed-width, so the day can be sliced out
+    return {
+        'hash': commit_hash,
+        'ts': ts,
+        'tz': tz,
+        'day': _parse_day(date_str[:10]),
+        'date': date_str,
+        'message': message,
+        'repo': repo_path
+    }
+
+
+def _cache_path(repo_path, scope):
+    """Return the cache file for repo_path scanned with the git arguments in scope."""
+    name = hashlib.sha1('\0'.join([repo_path] + scope).encode()).hexdigest()
+    return os.path.join(_CACHE_DIR, name + '.json')
+
+
+def _read_cache(path, key):
+    """Return the cached git log fields in path, or None if stale or missing."""
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get('format') != _CACHE_FORMAT or cached.get('key') != key:
+        return None
+    return cached['commits']
+
+
+def _write_cache(path, key, commits):
+    """Store the git log fields in path; a failed write only loses the cache."""
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        # Write a temp file and rename it over the old one
+        fd, tmp_path = tempfile.mkstemp(dir=_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'format': _CACHE_FORMAT, 'key': key, 'commits': [
+                    [c['hash'], c['ts'], c['tz'], c['date'], c['message']] for c in commits
+                ]}, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+# rewrite_history.sh building blocks; git filter-repo is used when installed
+_SCRIPT_HEADER = r'''#!/bin/bash
+
+set -e
+
+if git filter-repo --version >/dev/null 2>&1; then
+    USE_FILTER_REPO=1
+else
+    echo "git filter-repo not found, falling back to git filter-branch"
+fi
+
+FILTER_REPO_CALLBACK=$(cat <<'EOF'
+global _rewrite_dates
+if "_rewrite_dates" not in globals():
+    with open(os.environ["REWRITE_MAP"], "rb") as f:
+        _rewrite_dates = dict(line.split(b"\t")[:2] for line in f)
+new_date = _rewrite_dates.get(commit.original_id)
+if new_date:
+    commit.author_date = new_date
+    commit.committer_date = new_date
+EOF
+)
+'''
+
+# Each repo embeds a "hash<TAB><epoch> <tz><TAB>ISO date" map
+_REPO_HEADER = '''
+echo "Processing %s..."
+cd "%s"
+
+# Commit hash to new date mapping
+export REWRITE_MAP="$(mktemp)"
+cat > "$REWRITE_MAP" <<'EOF'
+'''
+
+_MAP_LINE = '%s\t%d %s\t%s\n'
+
+# The filter-branch fallback loads the map into shell variables once
+_REPO_FOOTER = r'''EOF
+
+if [ -n "$USE_FILTER_REPO" ]; then
+    git filter-repo --force --partial --commit-callback "$FILTER_REPO_CALLBACK"
+else
+    export FILTER_BRANCH_SQUELCH_WARNING=1
+    git filter-branch -f --env-filter '
+if [ -z "$rw_loaded" ]; then
+    tab=$(printf "\t")
+    while IFS="$tab" read -r h d _; do eval "rw_$h=\$d"; done < "$REWRITE_MAP"
+    rw_loaded=1
+fi
+eval "d=\${rw_$GIT_COMMIT-}"
+if [ -n "$d" ]; then
+    export GIT_AUTHOR_DATE="@$d"
+    export GIT_COMMITTER_DATE="@$d"
+fi
+' -- --all
+fi
+rm -f "$REWRITE_MAP"
+
+echo "✓ Completed!"
+'''
+
+
+def _date_range(first_date, last_date):
+    """Return every date from first_date to last_date inclusive."""
+    return [date.fromordinal(o)
+            for o in range(first_date.toordinal(), last_date.toordinal() + 1)]
+
+
+def _count_stats(values):
+    """Return total, mean, median, sample std dev, min and max of int counts."""
+    counts = sorted(values)
+    n = len(counts)
+    total = sum(counts)
+    total_sq = sum(map(mul, counts, counts))
+    mid = n // 2
+    
+    return {
+        'total_commits': total,
+        'days_with_commits': n,
+        'mean': total / n,
+        'median': counts[mid] if n % 2 else (counts[mid - 1] + counts[mid]) / 2,
+        'std_dev': math.sqrt((n * total_sq - total * total) / (n * (n - 1))) if n > 1 else 0,
+        'min': counts[0],
+        'max': counts[-1]
+    }
+
+
+def _daily_targets(first_ordinal, total_days, pool_size, seed):
+    """Return how many commits to place on each day of the range."""
+    rng = random.Random(seed)
+    targets = []
+    remaining = pool_size
+    
+    for ordinal in range(first_ordinal, first_ordinal + total_days):
+        # Weekend gets more commits (6-10), weekdays get fewer (2-6)
+        is_weekend = (ordinal - 1) % 7 >= 5  # Saturday=5, Sunday=6
+        
+        if is_weekend:
+            target_count = rng.randint(6, 10)
+        else:
+            target_count = rng.randint(2, 6)
+        
+        # Don't go past our commit pool
+        actual_count = min(target_count, remaining)
+        targets.append(actual_count)
+        remaining -= actual_count
+        
+        # Pool used up; the remaining days stay empty
+        if not remaining:
+            break
+    
+    targets += [0] * (total_days - len(targets))
+    return targets
+
 
 class ContributionRedistributor:
-    def __init__(self, target_std_dev=5, max_gap_days=7, github_email=None):
+    def __init__(self, target_std_dev=5, max_gap_days=7, github_email=None,
+                 include_all_refs=False, use_cache=True):
         self.target_std_dev = target_std_dev
         self.max_gap_days = max_gap_days
         self.github_email = github_email
+        self.include_all_refs = include_all_refs
+        self.use_cache = use_cache
         self.repos = []
-        self.commits_by_date = defaultdict(list)
+        self.commits_by_repo = {}
         self.redistribution_plan = {}
+        # Indexes of redistribution_plan by new day and by repo
+        self._plan_by_day = {}
+        self._plan_by_repo = {}
         
     def find_git_repos(self, base_dir):
         """Find all git repositories in the given directory."""
-        base_path = Path(base_dir)
-        repos = []
-        
-        for item in base_path.iterdir():
-            if item.is_dir() and (item / '.git').exists():
-                repos.append(str(item))
+        # Absolute paths, since the generated script cds between repos
+        base_path = os.path.abspath(base_dir)
         
-        return repos
+        with os.scandir(base_path) as entries:
+            return [entry.path for entry in entries
+                    if entry.is_dir() and os.path.exists(os.path.join(entry.path, '.git'))]
     
     def get_commits_from_repo(self, repo_path, days_back=365):
         """Extract all commits from a repository for the last N days."""
-        os.chdir(repo_path)
-        
         # Get date from N days ago
         since_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
         
-        # Get commits with author date, hash, and email
-        cmd = [
-            'git', 'log',
-            '--all',
-            '--pretty=format:%H|%aI|%s|%ae',
+        # Get hash, raw author date, ISO date, subject and email, NUL-separated
+        cmd = _GIT + [
+            'log',
+            '--all' if self.include_all_refs else '--branches',
+            '--no-merges',
+            '-z',
+            '--date=raw',
+            '--pretty=format:%H%x00%ad%x00%aI%x00%s%x00%ae',
             f'--since={since_date}'
         ]
         
+        # Let git filter by author, matching "<email>" as a fixed string
+        if self.github_email:
+            cmd += ['--fixed-strings', '--regexp-ignore-case',
+                    f'--author=<{self.github_email}>']
+        
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Reuse the cached parse while the refs and command are unchanged
+            if self.use_cache:
+                tips = subprocess.run(
+                    _GIT + ['rev-parse', '--all' if self.include_all_refs else '--branches'],
+                    capture_output=True, check=True, cwd=repo_path).stdout
+                # git log --all also walks a detached HEAD
+                if self.include_all_refs:
+                    tips += subprocess.run(
+                        _GIT + ['rev-parse', '-q', '--verify', 'HEAD'],
+                        capture_output=True, cwd=repo_path).stdout
+                cache_key = hashlib.sha1(tips + '\0'.join(cmd).encode()).hexdigest()
+                # One file per repo and ref/author selection
+                cache_file = _cache_path(
+                    repo_path, [arg for arg in cmd if not arg.startswith('--since=')])
+                cached = _read_cache(cache_file, cache_key)
+                if cached is not None:
+                    return [_make_commit(repo_path, *fields) for fields in cached]
+            
+            # Parse git's output as it streams in
+            email_filter = self.github_email.lower() if self.github_email else None
             commits = []
             
-            for line in result.stdout.strip().split('\n'):
-                if not line:
-                    continue
-                    
-                parts = line.split('|', 3)
-                if len(parts) >= 4:
-                    commit_hash, date_str, message, author_email = parts
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                  cwd=repo_path) as proc:
+                fields = _iter_nul_fields(proc.stdout)
+                for raw_hash, raw_when, raw_date, raw_message, raw_email in zip(
+                        fields, fields, fields, fields, fields):
+                    author_email = raw_email.decode('utf-8', errors='replace')
                     
-                    # Filter by email if specified
-                    if self.github_email and author_email.lower() != self.github_email.lower():
+                    # Filter by email if specified; double-checks git's --author match
+                    if email_filter and author_email.lower() != email_filter:
                         continue
                     
-                    commit_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    
-                    commits.append({
-                        'hash': commit_hash,
-                        'date': commit_date,
-                        'message': message,
-                        'email': author_email,
-                        'repo': repo_path,
-                        'original_date': commit_date
-                    })
+                    raw_ts, raw_tz = raw_when.split()
+                    commits.append(_make_commit(
+                        repo_path,
+                        raw_hash.decode('ascii'),
+                        int(raw_ts),
+                        raw_tz.decode('ascii'),
+                        raw_date.decode('ascii'),
+                        raw_message.decode('utf-8', errors='replace')
+                    ))
+            
+            if proc.returncode != 0:
+                raise subprocess.CalledProcessError(proc.returncode, cmd)
+            
+            if self.use_cache:
+                _write_cache(cache_file, cache_key, commits)
             
             return commits
         except subprocess.CalledProcessError as e:
@@ -82,117 +322,100 @@ class ContributionRedistributor:
     
     def analyze_contributions(self):
         """Analyze contribution patterns and identify gaps."""
-        # Group commits by date
-        date_counts = defaultdict(int)
-        
-        for commits in self.commits_by_date.values():
-            for commit in commits:
-                date_key = commit['date'].date()
-                date_counts[date_key] += 1
+        # Tally commits per local calendar day, as on the GitHub graph
+        date_counts = Counter(
+            map(itemgetter('day'), chain.from_iterable(self.commits_by_repo.values()))
+        )
         
         # Calculate statistics
         if not date_counts:
             print("No commits found in the last 365 days!")
             return None
         
-        counts = list(date_counts.values())
-        
-        stats = {
-            'total_commits': sum(counts),
-            'days_with_commits': len(date_counts),
-            'mean': statistics.mean(counts),
-            'median': statistics.median(counts),
-            'std_dev': statistics.stdev(counts) if len(counts) > 1 else 0,
-            'min': min(counts),
-            'max': max(counts)
-        }
+        stats = _count_stats(date_counts.values())
         
-        # Find gaps
+        # Find gaps: diff consecutive day ordinals, build records only for big ones
         all_dates = sorted(date_counts.keys())
-        gaps = []
-        
-        for i in range(len(all_dates) - 1):
-            current = all_dates[i]
-            next_date = all_dates[i + 1]
-            gap_days = (next_date - current).days - 1
-            
-            if gap_days > self.max_gap_days:
-                gaps.append({
-                    'start': current,
-                    'end': next_date,
-                    'days': gap_days,
-                    'commits_before': date_counts[current],
-                    'commits_after': date_counts[next_date]
-                })
+        ordinals = list(map(date.toordinal, all_dates))
+        gaps = [
+            {
+                'start': all_dates[i],
+                'end': all_dates[i + 1],
+                'days': step - 1,
+                'commits_before': date_counts[all_dates[i]],
+                'commits_after': date_counts[all_dates[i + 1]]
+            }
+            for i, step in enumerate(map(sub, ordinals[1:], ordinals))
+            if step - 1 > self.max_gap_days
+        ]
         
         return stats, gaps, date_counts
     
     def create_redistribution_plan(self, date_counts):
         """Create a plan to redistribute commits with weekend prioritization."""
-        import random
-        
-        # Get all commits sorted by date
-        all_commits = []
-        for commits in self.commits_by_date.values():
-            all_commits.extend(commits)
-        
-        all_commits.sort(key=lambda x: x['date'])
+        # Get all commits sorted by date (each repo's list reversed to oldest first)
+        all_commits = list(chain.from_iterable(map(reversed, self.commits_by_repo.values())))
+        all_commits.sort(key=itemgetter('ts'))
         
         if not all_commits:
             return {}
         
         # Get date range
-        first_date = all_commits[0]['date'].date()
-        last_date = all_commits[-1]['date'].date()
+        first_date = all_commits[0]['day']
+        last_date = all_commits[-1]['day']
         total_days = (last_date - first_date).days + 1
         total_commits = len(all_commits)
         
-        # Create ideal distribution
-        current_date = first_date
-        ideal_distribution = {}
-        
-        while current_date <= last_date:
-            ideal_distribution[current_date] = []
-            current_date += timedelta(days=1)
-        
         # Distribute commits with weekend prioritization
-        commits_to_distribute = all_commits.copy()
+        cursor = 0
         plan = {}
+        # Group by day and repo as the plan is built
+        plan_by_day = {}
+        plan_by_repo = defaultdict(list)
         
-        for date in sorted(ideal_distribution.keys()):
-            random.seed(int(date.strftime('%Y%m%d')))
-            
-            # Weekend gets more commits (6-10), weekdays get fewer (2-6)
-            is_weekend = date.weekday() >= 5  # Saturday=5, Sunday=6
-            
-            if is_weekend:
-                target_count = random.randint(6, 10)
-            else:
-                target_count = random.randint(2, 6)
-            
-            # Don't go past our commit pool
-            actual_count = min(target_count, len(commits_to_distribute))
-            
+        # Seeding from the range start keeps plans reproducible
+        first_ordinal = first_date.toordinal()
+        targets = _daily_targets(first_ordinal, total_days, total_commits, first_ordinal)
+        
+        for day, actual_count in zip(_date_range(first_date, last_date), targets):
             if actual_count > 0:
                 # Take commits from the pool
-                day_commits = commits_to_distribute[:actual_count]
-                commits_to_distribute = commits_to_distribute[actual_count:]
+                day_commits = all_commits[cursor:cursor + actual_count]
+                cursor += actual_count
+                ordinal = day.toordinal()
+                day_iso = day.isoformat()
+                day_infos = plan_by_day[day] = []
                 
                 for commit in day_commits:
-                    new_datetime = datetime.combine(
-                        date,
-                        commit['date'].time()
-                    ).replace(tzinfo=commit['date'].tzinfo)
-                    
-                    plan[commit['hash']] = {
-                        'old_date': commit['date'],
-                        'new_date': new_datetime,
+                    # Keep the original time of day and offset, move only the day
+                    info = plan[commit['hash']] = {
+                        'new_day': day,
+                        'new_ts': commit['ts'] + (ordinal - commit['day'].toordinal()) * 86400,
+                        'tz': commit['tz'],
+                        'new_date': day_iso + commit['date'][10:],
                         'repo': commit['repo'],
                         'message': commit['message']
                     }
+                    day_infos.append(info)
+                    plan_by_repo[commit['repo']].append((commit['hash'], info))
         
+        self.redistribution_plan = plan
+        self._plan_by_day = plan_by_day
+        self._plan_by_repo = plan_by_repo
         return plan
     
+    def _plan_index(self, plan):
+        """Return plan grouped by new day and by repo."""
+        if plan is self.redistribution_plan:
+            return self._plan_by_day, self._plan_by_repo
+        
+        by_new_date = defaultdict(list)
+        by_repo = defaultdict(list)
+        for commit_hash, info in plan.items():
+            by_new_date[info['new_day']].append(info)
+            by_repo[info['repo']].append((commit_hash, info))
+        return by_new_date, by_repo
+    
     def print_analysis(self, stats, gaps, date_counts):
         """Print analysis results."""
         print("\n" + "="*60)
@@ -223,147 +446,118 @@ class ContributionRedistributor:
         print("REDISTRIBUTION PLAN")
         print("="*60)
         
-        # Group by date
-        by_new_date = defaultdict(list)
-        for commit_hash, info in plan.items():
-            by_new_date[info['new_date'].date()].append(info)
+        by_new_date, _ = self._plan_index(plan)
         
         print(f"\nTotal commits to redistribute: {len(plan)}")
         print(f"Date range: {min(by_new_date.keys())} → {max(by_new_date.keys())}")
         
         # Calculate new stats
-        counts = [len(commits) for commits in by_new_date.values()]
-        new_std = statistics.stdev(counts) if len(counts) > 1 else 0
+        new_stats = _count_stats(map(len, by_new_date.values()))
         
         print(f"\n📈 New distribution:")
-        print(f"  Days with commits: {len(by_new_date)}")
-        print(f"  Mean commits/day: {statistics.mean(counts):.2f}")
-        print(f"  Standard deviation: {new_std:.2f}")
-        print(f"  Range: {min(counts)} - {max(counts)}")
+        print(f"  Days with commits: {new_stats['days_with_commits']}")
+        print(f"  Mean commits/day: {new_stats['mean']:.2f}")
+        print(f"  Standard deviation: {new_stats['std_dev']:.2f}")
+        print(f"  Range: {new_stats['min']} - {new_stats['max']}")
         
         # Show newly added green days
         all_dates = sorted(by_new_date.keys())
         first_date = all_dates[0]
         last_date = all_dates[-1]
         
-        blank_days_before = []
-        current = first_date
-        while current <= last_date:
-            if current not in original_date_counts or original_date_counts[current] == 0:
-                blank_days_before.append(current)
-            current += timedelta(days=1)
+        blank_days_before = [day for day in _date_range(first_date, last_date)
+                             if not original_date_counts.get(day)]
         
-        newly_green_days = [date for date in by_new_date.keys() 
-                           if date not in original_date_counts or original_date_counts[date] == 0]
+        newly_green_days = [day for day in by_new_date.keys() 
+                           if day not in original_date_counts or original_date_counts[day] == 0]
         
         print(f"\n🟩 NEW GREEN DAYS (was blank, now has commits):")
         print(f"  Total: {len(newly_green_days)} days")
         if newly_green_days:
             print(f"\n  Sample of newly added days:")
-            for date in sorted(newly_green_days)[:15]:
-                day_name = date.strftime('%a')
-                weekend = "🎮 WEEKEND" if date.weekday() >= 5 else ""
-                print(f"    {date} ({day_name}): {len(by_new_date[date])} commits {weekend}")
+            for day in sorted(newly_green_days)[:15]:
+                day_name = _DAY_ABBR[day.weekday()]
+                weekend = "🎮 WEEKEND" if day.weekday() >= 5 else ""
+                print(f"    {day} ({day_name}): {len(by_new_date[day])} commits {weekend}")
             
             if len(newly_green_days) > 15:
                 print(f"    ... and {len(newly_green_days) - 15} more days")
         
         print(f"\n⬜ BLANK DAYS REMAINING:")
-        remaining_blank = [date for date in blank_days_before if date not in by_new_date]
+        remaining_blank = [day for day in blank_days_before if day not in by_new_date]
         print(f"  Total: {len(remaining_blank)} days")
         if remaining_blank and len(remaining_blank) <= 10:
-            for date in remaining_blank[:10]:
-                print(f"    {date}")
+            for day in remaining_blank[:10]:
+                print(f"    {day}")
         
         print("\n" + "="*60)
     
     def save_detailed_log(self, plan, date_counts, output_file='redistribution_log.txt'):
         """Save detailed before/after log to file."""
-        by_new_date = defaultdict(list)
-        for commit_hash, info in plan.items():
-            by_new_date[info['new_date'].date()].append(info)
+        by_new_date, _ = self._plan_index(plan)
         
         all_dates = sorted(by_new_date.keys())
         first_date = all_dates[0]
         last_date = all_dates[-1]
         
-        with open(output_file, 'w') as f:
-            f.write("GitHub Contribution Redistribution Log\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write("="*70 + "\n\n")
-            
-            f.write("BEFORE REDISTRIBUTION:\n")
-            f.write("-" * 70 + "\n")
-            current = first_date
-            while current <= last_date:
-                count = date_counts.get(current, 0)
-                status = "✓" if count > 0 else "✗"
-                day_name = current.strftime('%a')
-                f.write(f"{status} {current} ({day_name:3s}): {count:2d} commits\n")
-                current += timedelta(days=1)
-            
-            f.write("\n" + "="*70 + "\n\n")
-            f.write("AFTER REDISTRIBUTION:\n")
-            f.write("-" * 70 + "\n")
-            current = first_date
-            while current <= last_date:
-                new_count = len(by_new_date.get(current, []))
-                old_count = date_counts.get(current, 0)
-                day_name = current.strftime('%a')
-                weekend = " [WEEKEND]" if current.weekday() >= 5 else ""
-                
-                if old_count == 0 and new_count > 0:
-                    status = "🟩 NEW"
-                elif new_count > 0:
-                    status = "✓    "
-                else:
-                    status = "✗    "
-                
-                change = f"(+{new_count - old_count})" if new_count != old_count else ""
-                f.write(f"{status} {current} ({day_name:3s}): {new_count:2d} commits {change}{weekend}\n")
-                current += timedelta(days=1)
+        # Per-day columns shared by both sections
+        dates = _date_range(first_date, last_date)
+        old_counts = [date_counts.get(day, 0) for day in dates]
+        new_counts = [len(by_new_date.get(day, ())) for day in dates]
+        weekdays = [day.weekday() for day in dates]
+        # "2024-08-17 (Sat)"
+        day_labels = [f"{day.isoformat()} ({_DAY_ABBR[weekday]})"
+                      for day, weekday in zip(dates, weekdays)]
+        weekends = [" [WEEKEND]" if weekday >= 5 else "" for weekday in weekdays]
+        
+        lines = [
+            "GitHub Contribution Redistribution Log\n",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+            "="*70 + "\n\n",
+            "BEFORE REDISTRIBUTION:\n",
+            "-" * 70 + "\n",
+        ]
+        
+        for day_label, old_count in zip(day_labels, old_counts):
+            status = "✓" if old_count > 0 else "✗"
+            lines.append(f"{status} {day_label}: {old_count:2d} commits\n")
+        
+        lines.append("\n" + "="*70 + "\n\n")
+        lines.append("AFTER REDISTRIBUTION:\n")
+        lines.append("-" * 70 + "\n")
+        for day_label, old_count, new_count, weekend in zip(
+                day_labels, old_counts, new_counts, weekends):
+            if old_count == 0 and new_count > 0:
+                status = "🟩 NEW"
+            elif new_count > 0:
+                status = "✓    "
+            else:
+                status = "✗    "
             
-            f.write("\n" + "="*70 + "\n")
+            change = f"(+{new_count - old_count})" if new_count != old_count else ""
+            lines.append(f"{status} {day_label}: {new_count:2d} commits {change}{weekend}\n")
+        
+        lines.append("\n" + "="*70 + "\n")
+        
+        # Write log
+        with open(output_file, 'w') as f:
+            f.write(''.join(lines))
         
         print(f"\n📝 Detailed log saved to: {output_file}")
     
     def generate_rewrite_script(self, plan, output_file='rewrite_history.sh'):
         """Generate a bash script to rewrite git history."""
-        script_lines = ['#!/bin/bash', '', 'set -e', '']
-        
-        # Group by repo
-        by_repo = defaultdict(list)
-        for commit_hash, info in plan.items():
-            by_repo[info['repo']].append((commit_hash, info))
-        
-        for repo, commits in by_repo.items():
-            script_lines.append(f'echo "Processing {repo}..."')
-            script_lines.append(f'cd "{repo}"')
-            script_lines.append('')
-            
-            # Create git filter-branch command
-            script_lines.append('# Create commit hash to new date mapping')
-            script_lines.append('export FILTER_BRANCH_SQUELCH_WARNING=1')
-            script_lines.append('')
-            
-            # Generate the filter command
-            script_lines.append('git filter-branch -f --env-filter \'')
-            
-            for commit_hash, info in commits:
-                new_date = info['new_date'].strftime('%a %b %d %H:%M:%S %Y %z')
-                script_lines.append(f'if [ "$GIT_COMMIT" = "{commit_hash}" ]; then')
-                script_lines.append(f'    export GIT_AUTHOR_DATE="{new_date}"')
-                script_lines.append(f'    export GIT_COMMITTER_DATE="{new_date}"')
-                script_lines.append('fi')
-            
-            script_lines.append('\' --all')
-            script_lines.append('')
-            script_lines.append('echo "✓ Completed!"')
-            script_lines.append('')
+        _, by_repo = self._plan_index(plan)
         
         # Write script
-        with open(output_file, 'w') as f:
-            f.write('\n'.join(script_lines))
+        with open(output_file, 'w', buffering=1 << 20) as f:
+            f.write(_SCRIPT_HEADER)
+            for repo, commits in by_repo.items():
+                f.write(_REPO_HEADER % (repo, repo))
+                f.writelines(
+                    _MAP_LINE % (commit_hash, info['new_ts'], info['tz'], info['new_date'])
+                    for commit_hash, info in commits)
+                f.write(_REPO_FOOTER)
         
         os.chmod(output_file, 0o755)
         print(f"\n✅ Rewrite script generated: {output_file}")
@@ -385,24 +579,18 @@ class ContributionRedistributor:
         
         # Collect all commits
         print("\n📥 Collecting commit history...")
-        all_commits = []
         
-        for repo in repos:
-            commits = self.get_commits_from_repo(repo)
-            all_commits.extend(commits)
-            print(f"  {os.path.basename(repo)}: {len(commits)} commits")
+        # git log is subprocess-bound, so threads overlap the per-repo walks
+        max_workers = min(os.cpu_count() or 1, len(repos))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for repo, commits in zip(repos, executor.map(self.get_commits_from_repo, repos)):
+                self.commits_by_repo[repo] = commits
+                print(f"  {os.path.basename(repo)}: {len(commits)} commits")
         
-        if not all_commits:
+        if not any(self.commits_by_repo.values()):
             print("❌ No commits found!")
             return
         
-        # Store commits by repo
-        for commit in all_commits:
-            repo = commit['repo']
-            if repo not in self.commits_by_date:
-                self.commits_by_date[repo] = []
-            self.commits_by_date[repo].append(commit)
-        
         # Analyze
         result = self.analyze_contributions()
         if not result:
@@ -447,13 +635,20 @@ if __name__ == '__main__':
         print("Could not detect git email. All commits will be counted.")
         print("To filter by email, run: git config --global user.email 'your@email.com'")
     
+    # Only local branches are scanned unless --all asks for every ref
+    args = sys.argv[1:]
+    include_all_refs = '--all' in args
+    if include_all_refs:
+        args.remove('--all')
+    
     redistributor = ContributionRedistributor(
         target_std_dev=5, 
         max_gap_days=7,
-        github_email=github_email
+        github_email=github_email,
+        include_all_refs=include_all_refs
     )
     
     # Use parent directory of current script location
-    base_dir = sys.argv[1] if len(sys.argv) > 1 else str(Path.home() / 'git')
+    base_dir = args[0] if args else str(Path.home() / 'git')
     
     redistributor.run(base_dir)